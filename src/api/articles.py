@@ -6,15 +6,17 @@ SCRUM-8: Create article listing and search functionality
 SCRUM-9: Implement scheduled article publishing
 """
 
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from ..models.article import ArticleStatus
 from ..services.article_service import ArticleService
-from ..api.auth import oauth2_scheme
-from ..core.security import decode_token
+from ..api.auth import get_current_payload, get_optional_payload, require_role
+from ..core.cache import invalidate, redis_cached
+from ..core.config import settings
 
 router = APIRouter()
 
@@ -43,6 +45,14 @@ class UpdateArticleRequest(BaseModel):
 class SchedulePublishRequest(BaseModel):
     """SCRUM-9: Scheduled publishing"""
     publish_at: datetime
+    
+    @property
+    def publish_at_epoch(self) -> float:
+        """publish_at as a UNIX timestamp; naive datetimes are treated as UTC."""
+        publish_at = self.publish_at
+        if publish_at.tzinfo is None:
+            publish_at = publish_at.replace(tzinfo=timezone.utc)
+        return publish_at.timestamp()
 
 
 class ArticleResponse(BaseModel):
@@ -60,8 +70,7 @@ class ArticleResponse(BaseModel):
     created_at: datetime
     published_at: Optional[datetime]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ArticleListResponse(BaseModel):
@@ -69,59 +78,81 @@ class ArticleListResponse(BaseModel):
     total: int
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
 
 
 @router.get("/", response_model=ArticleListResponse)
+@redis_cached(
+    ttl=settings.CACHE_TTL,
+    key_fn=lambda **kw: f"articles:list:{kw['page']}:{kw['per_page']}:{kw['category']}:{kw['search']}:{kw['cursor']}"
+)
 async def list_articles(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
     category: Optional[str] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
     article_service: ArticleService = Depends()
 ):
     """
     List published articles with pagination.
     SCRUM-8: Create article listing and search functionality
+    Pass next_cursor from the previous page to continue paging.
     """
-    articles, total = await article_service.list_published(
-        page=page,
-        per_page=per_page,
-        category=category,
-        search_query=search
-    )
+    try:
+        articles, total, next_cursor = await article_service.list_published(
+            page=page,
+            per_page=per_page,
+            category=category,
+            search_query=search,
+            cursor=cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
     
     return ArticleListResponse(
         articles=articles,
         total=total,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/search")
+@redis_cached(
+    ttl=settings.CACHE_TTL,
+    key_fn=lambda **kw: f"articles:search:{kw['q']}:{kw['page']}:{kw['per_page']}:{kw['cursor']}"
+)
 async def search_articles(
     q: str = Query(..., min_length=2),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     article_service: ArticleService = Depends()
 ):
     """
     Full-text search for articles.
     SCRUM-8: Uses Elasticsearch for search
     SCRUM-21: Set up Elasticsearch for article search
+    Pass next_cursor from the previous page to continue paging.
     """
-    results = await article_service.search(
-        query=q,
-        page=page,
-        per_page=per_page
-    )
+    try:
+        results = await article_service.search(
+            query=q,
+            page=page,
+            per_page=per_page,
+            cursor=cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
     return results
 
 
 @router.get("/{slug}", response_model=ArticleResponse)
 async def get_article(
     slug: str,
-    token: Optional[str] = Depends(oauth2_scheme),
+    payload: Optional[dict] = Depends(get_optional_payload),
     article_service: ArticleService = Depends()
 ):
     """Get a single article by slug."""
@@ -130,17 +161,17 @@ async def get_article(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
     
     # Check premium access - SCRUM-13, SCRUM-29
-    if article.is_premium:
-        if not token:
+    if article["is_premium"]:
+        if not payload:
             raise HTTPException(status_code=status.HTTP_402_PAYMENT_REQUIRED, detail="Premium content requires subscription")
         
-        user_id = decode_token(token).get("sub")
+        user_id = payload.get("sub")
         can_access = await article_service.check_premium_access(user_id)
         if not can_access:
             raise HTTPException(status_code=status.HTTP_402_PAYMENT_REQUIRED, detail="Upgrade to access premium content")
     
     # Increment view count
-    await article_service.increment_views(article.id)
+    await article_service.increment_views(article["id"])
     
     return article
 
@@ -148,14 +179,13 @@ async def get_article(
 @router.post("/", response_model=ArticleResponse)
 async def create_article(
     request: CreateArticleRequest,
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     article_service: ArticleService = Depends()
 ):
     """
     Create a new article draft.
     SCRUM-6: Implement rich text editor for article creation
     """
-    payload = decode_token(token)
     author_id = payload.get("sub")
     
     article = await article_service.create(
@@ -176,14 +206,13 @@ async def create_article(
 @router.post("/{article_id}/submit")
 async def submit_for_review(
     article_id: int,
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     article_service: ArticleService = Depends()
 ):
     """
     Submit article for editorial review.
     SCRUM-7: Build article publishing workflow API
     """
-    payload = decode_token(token)
     author_id = payload.get("sub")
     
     article = await article_service.submit_for_review(article_id, author_id)
@@ -196,24 +225,20 @@ async def submit_for_review(
 @router.post("/{article_id}/publish")
 async def publish_article(
     article_id: int,
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(require_role("editor", "admin", detail="Only editors can publish")),
     article_service: ArticleService = Depends()
 ):
     """
     Publish an article (editor only).
     SCRUM-7: Build article publishing workflow API
     """
-    payload = decode_token(token)
-    editor_id = payload.get("sub")
-    
-    # Verify editor role
-    if not await article_service.is_editor(editor_id):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only editors can publish")
-    
     article = await article_service.publish(article_id)
     if not article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
     
+    # Cached listings and search results no longer reflect the published set - SCRUM-20
+    await invalidate("articles:*")
+    
     return {"message": "Article published", "published_at": article.published_at}
 
 
@@ -221,19 +246,19 @@ async def publish_article(
 async def schedule_publish(
     article_id: int,
     request: SchedulePublishRequest,
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     article_service: ArticleService = Depends()
 ):
     """
     Schedule article for future publishing.
     SCRUM-9: Implement scheduled article publishing
     """
-    if request.publish_at <= datetime.utcnow():
+    if request.publish_at_epoch <= time.time():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Scheduled time must be in the future")
     
     article = await article_service.schedule_publish(article_id, request.publish_at)
     if not article:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
     
     return {"message": "Article scheduled", "scheduled_for": article.scheduled_for}
 
@@ -241,7 +266,7 @@ async def schedule_publish(
 @router.delete("/{article_id}/schedule")
 async def cancel_scheduled_publish(
     article_id: int,
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     article_service: ArticleService = Depends()
 ):
     """
@@ -249,4 +274,7 @@ async def cancel_scheduled_publish(
     SCRUM-9: Return article to draft status
     """
     article = await article_service.cancel_schedule(article_id)
+    if not article:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
+    
     return {"message": "Schedule cancelled", "status": article.status.value}
@@ -5,6 +5,7 @@ SCRUM-12: Add social login with Google and Apple
 """
 
 from datetime import timedelta
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr
@@ -16,10 +17,55 @@ from ..core.security import (
     create_refresh_token,
     decode_token
 )
+from ..core.tasks import revoke_all_tokens_task
+from ..models.user import UserRole
 from ..services.user_service import UserService
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+# Does not raise when the Authorization header is missing
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
+
+
+async def get_current_payload(token: str = Depends(oauth2_scheme)) -> dict:
+    """
+    Resolve the bearer token to its JWT payload.
+    FastAPI caches dependencies per request, so the token is decoded once.
+    """
+    payload = decode_token(token)
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return payload
+
+
+async def get_optional_payload(token: Optional[str] = Depends(oauth2_scheme_optional)) -> Optional[dict]:
+    """Resolve the bearer token if one was sent, for endpoints with optional auth."""
+    if not token:
+        return None
+    return decode_token(token)
+
+
+def require_role(*roles: str, detail: Optional[str] = None):
+    """
+    Build a dependency that admits only tokens carrying one of the given roles.
+    Roles are signed into the access token at login, so no user lookup is needed.
+    """
+    async def check_role(payload: dict = Depends(get_current_payload)) -> dict:
+        if not set(payload.get("roles", ())) & set(roles):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+        return payload
+    return check_role
+
+
+def _access_token_claims(user) -> dict:
+    """Claims embedded in every access token - SCRUM-11"""
+    # role is nullable on older rows; treat those users as readers
+    role = user.role or UserRole.READER
+    return {"sub": str(user.id), "email": user.email, "roles": [role.value]}
 
 
 class LoginRequest(BaseModel):
@@ -69,7 +115,7 @@ async def login(request: LoginRequest, user_service: UserService = Depends()):
             detail="Invalid email or password"
         )
     
-    access_token = create_access_token(data={"sub": str(user.id), "email": user.email})
+    access_token = create_access_token(data=_access_token_claims(user))
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
     
     # Store refresh token in Redis for rotation - SCRUM-11
@@ -110,7 +156,7 @@ async def refresh_token(request: RefreshRequest, user_service: UserService = Dep
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
     
     # Create new token pair and rotate refresh token
-    new_access_token = create_access_token(data={"sub": str(user.id), "email": user.email})
+    new_access_token = create_access_token(data=_access_token_claims(user))
     new_refresh_token = create_refresh_token(data={"sub": str(user.id)})
     
     # Invalidate old refresh token and store new one - SCRUM-11
@@ -143,14 +189,11 @@ async def register(request: RegisterRequest, user_service: UserService = Depends
 
 
 @router.post("/logout")
-async def logout(
-    token: str = Depends(oauth2_scheme),
-    user_service: UserService = Depends()
-):
+async def logout(token: str = Depends(oauth2_scheme)):
     """Logout and invalidate tokens."""
     payload = decode_token(token)
     if payload:
-        await user_service.revoke_all_tokens(payload.get("sub"))
+        revoke_all_tokens_task.delay(payload.get("sub"))
     return {"message": "Logged out successfully"}
 
 
@@ -168,7 +211,7 @@ async def google_login(request: GoogleLoginRequest, user_service: UserService =
     # Find or create user
     user = await user_service.find_or_create_google_user(google_user)
     
-    access_token = create_access_token(data={"sub": str(user.id), "email": user.email})
+    access_token = create_access_token(data=_access_token_claims(user))
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
     
     return LoginResponse(access_token=access_token, refresh_token=refresh_token, expires_in=900)
@@ -186,7 +229,7 @@ async def apple_login(request: AppleLoginRequest, user_service: UserService = De
     
     user = await user_service.find_or_create_apple_user(apple_user, request.user_info)
     
-    access_token = create_access_token(data={"sub": str(user.id), "email": user.email})
+    access_token = create_access_token(data=_access_token_claims(user))
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
     
     return LoginResponse(access_token=access_token, refresh_token=refresh_token, expires_in=900)
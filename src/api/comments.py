@@ -6,24 +6,96 @@ SCRUM-18: Add reaction system for articles and comments
 """
 
 from datetime import datetime
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel
+from typing import Optional
+
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError
+from sqlalchemy.orm import Session
 
 from ..services.comment_service import CommentService
-from ..api.auth import oauth2_scheme
-from ..core.security import decode_token
+from ..core.cache import redis_client
+from ..core.database import get_db
+from ..core.loaders import UserLoader, get_user_loader
+from ..api.auth import get_current_payload, require_role
+from ..core.tasks import flag_comment_task
 
 router = APIRouter()
 
+_VALID_REACTIONS = frozenset({"like", "love", "angry", "sad", "wow"})  # SCRUM-18
+_VALID_MOD_ACTIONS = frozenset({"approve", "reject", "delete"})  # SCRUM-17
+
 
-class CreateCommentRequest(BaseModel):
+class CreateCommentRequest(msgspec.Struct):
     """SCRUM-16: Threaded comment"""
     content: str
     article_id: int
     parent_id: Optional[int] = None  # For replies
 
 
+class _CreateCommentBody(BaseModel):
+    """Pydantic twin of CreateCommentRequest, only used to describe rejected bodies."""
+    content: str
+    article_id: int
+    parent_id: Optional[int] = None
+
+
+_create_comment_errors = TypeAdapter(_CreateCommentBody)
+
+
+# Decodes the hot create-comment body straight into the struct, no intermediate dict.
+# Lax mode coerces numeric strings like "5" the way pydantic did.
+_create_comment_decoder = msgspec.json.Decoder(CreateCommentRequest, strict=False)
+
+# The body isn't a pydantic model, so describe it to OpenAPI explicitly
+_, _create_comment_components = msgspec.json.schema_components(
+    (CreateCommentRequest,), ref_template="#/components/schemas/{name}"
+)
+_CREATE_COMMENT_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": _create_comment_components["CreateCommentRequest"]}
+        }
+    }
+}
+
+
+async def get_comment_service(
+    db: Session = Depends(get_db),
+    user_loader: UserLoader = Depends(get_user_loader)
+) -> CommentService:
+    """
+    CommentService bound to Redis for every route, so writes invalidate the
+    thread cache that reads fill. Authors resolve through the request's loader.
+    """
+    return CommentService(db, cache=redis_client, user_loader=user_loader)
+
+
+def _validation_error(body: bytes) -> RequestValidationError:
+    """Build FastAPI's standard 422 error list for a body msgspec rejected."""
+    try:
+        _create_comment_errors.validate_json(body)
+    except ValidationError as exc:
+        return RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in exc.errors(include_url=False)
+        ])
+    # Accepted by pydantic but not msgspec; report without a field location
+    return RequestValidationError([{"loc": ("body",), "msg": "Invalid request body", "type": "value_error"}])
+
+
+async def _decode_create_comment(request: Request) -> CreateCommentRequest:
+    """Parse and validate a create-comment body with msgspec - SCRUM-16"""
+    body = await request.body()
+    try:
+        return _create_comment_decoder.decode(body)
+    except msgspec.DecodeError as exc:
+        # Rejections are rare, so re-validate with pydantic for its standard errors
+        raise _validation_error(body) from exc
+
+
 class UpdateCommentRequest(BaseModel):
     content: str
 
@@ -48,10 +120,8 @@ class CommentResponse(BaseModel):
     parent_id: Optional[int]
     is_edited: bool
     created_at: datetime
-    replies: List["CommentResponse"] = []
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 @router.get("/article/{article_id}")
@@ -59,11 +129,11 @@ async def get_article_comments(
     article_id: int,
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=100),
-    comment_service: CommentService = Depends()
+    comment_service: CommentService = Depends(get_comment_service)
 ):
     """
     Get comments for an article with threading.
-    SCRUM-16: Build threaded comment system
+    SCRUM-16: Returned flat; clients nest replies by parent_id
     """
     comments = await comment_service.get_article_comments(
         article_id=article_id,
@@ -73,17 +143,16 @@ async def get_article_comments(
     return {"comments": comments, "article_id": article_id}
 
 
-@router.post("/", response_model=CommentResponse)
+@router.post("/", response_model=CommentResponse, openapi_extra=_CREATE_COMMENT_OPENAPI)
 async def create_comment(
-    request: CreateCommentRequest,
-    token: str = Depends(oauth2_scheme),
-    comment_service: CommentService = Depends()
+    request: CreateCommentRequest = Depends(_decode_create_comment),
+    payload: dict = Depends(get_current_payload),
+    comment_service: CommentService = Depends(get_comment_service)
 ):
     """
     Create a new comment or reply.
     SCRUM-16: Build threaded comment system
     """
-    payload = decode_token(token)
     author_id = payload.get("sub")
     
     # Rate limiting - max 10 comments per hour
@@ -94,21 +163,16 @@ async def create_comment(
             detail="Comment rate limit exceeded. Try again later."
         )
     
-    # Check nesting depth (max 3 levels) - SCRUM-16
-    if request.parent_id:
-        depth = await comment_service.get_comment_depth(request.parent_id)
-        if depth >= 3:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Maximum reply depth reached"
-            )
-    
-    comment = await comment_service.create(
-        content=request.content,
-        article_id=request.article_id,
-        author_id=author_id,
-        parent_id=request.parent_id
-    )
+    # Nesting depth (max 3 levels) is enforced on insert - SCRUM-16
+    try:
+        comment = await comment_service.create(
+            content=request.content,
+            article_id=request.article_id,
+            author_id=author_id,
+            parent_id=request.parent_id
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
     
     return comment
 
@@ -117,11 +181,10 @@ async def create_comment(
 async def update_comment(
     comment_id: int,
     request: UpdateCommentRequest,
-    token: str = Depends(oauth2_scheme),
-    comment_service: CommentService = Depends()
+    payload: dict = Depends(get_current_payload),
+    comment_service: CommentService = Depends(get_comment_service)
 ):
     """Edit a comment (shows as edited) - SCRUM-16"""
-    payload = decode_token(token)
     author_id = payload.get("sub")
     
     comment = await comment_service.update(comment_id, author_id, request.content)
@@ -134,11 +197,10 @@ async def update_comment(
 @router.delete("/{comment_id}")
 async def delete_comment(
     comment_id: int,
-    token: str = Depends(oauth2_scheme),
-    comment_service: CommentService = Depends()
+    payload: dict = Depends(get_current_payload),
+    comment_service: CommentService = Depends(get_comment_service)
 ):
     """Delete own comment - SCRUM-16"""
-    payload = decode_token(token)
     author_id = payload.get("sub")
     
     success = await comment_service.delete(comment_id, author_id)
@@ -154,17 +216,16 @@ async def delete_comment(
 async def add_reaction(
     comment_id: int,
     request: AddReactionRequest,
-    token: str = Depends(oauth2_scheme),
-    comment_service: CommentService = Depends()
+    payload: dict = Depends(get_current_payload),
+    comment_service: CommentService = Depends(get_comment_service)
 ):
     """
     Add or toggle a reaction on a comment.
     SCRUM-18: Add reaction system for articles and comments
     """
-    if request.reaction_type not in ["like", "love", "angry", "sad", "wow"]:
+    if request.reaction_type not in _VALID_REACTIONS:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid reaction type")
     
-    payload = decode_token(token)
     user_id = payload.get("sub")
     
     result = await comment_service.toggle_reaction(comment_id, user_id, request.reaction_type)
@@ -174,7 +235,7 @@ async def add_reaction(
 @router.get("/{comment_id}/reactions")
 async def get_reactions(
     comment_id: int,
-    comment_service: CommentService = Depends()
+    comment_service: CommentService = Depends(get_comment_service)
 ):
     """Get reaction counts for a comment - SCRUM-18"""
     reactions = await comment_service.get_reaction_counts(comment_id)
@@ -183,37 +244,28 @@ async def get_reactions(
 
 # ============ Moderation - SCRUM-17 ============
 
-@router.post("/{comment_id}/flag")
+@router.post("/{comment_id}/flag", status_code=status.HTTP_202_ACCEPTED)
 async def flag_comment(
     comment_id: int,
     reason: str = Query(...),
-    token: str = Depends(oauth2_scheme),
-    comment_service: CommentService = Depends()
+    payload: dict = Depends(get_current_payload)
 ):
     """Flag a comment for moderation - SCRUM-17"""
-    payload = decode_token(token)
     reporter_id = payload.get("sub")
     
-    await comment_service.flag_comment(comment_id, reporter_id, reason)
+    flag_comment_task.delay(comment_id, reporter_id, reason)
     return {"message": "Comment flagged for review"}
 
 
 @router.get("/moderation/queue")
 async def get_moderation_queue(
-    token: str = Depends(oauth2_scheme),
-    comment_service: CommentService = Depends()
+    payload: dict = Depends(require_role("editor", "admin")),
+    comment_service: CommentService = Depends(get_comment_service)
 ):
     """
     Get flagged comments for moderation.
     SCRUM-17: Implement comment moderation system
     """
-    payload = decode_token(token)
-    moderator_id = payload.get("sub")
-    
-    # Verify moderator role
-    if not await comment_service.is_moderator(moderator_id):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
-    
     queue = await comment_service.get_moderation_queue()
     return {"flagged_comments": queue}
 
@@ -222,20 +274,16 @@ async def get_moderation_queue(
 async def moderate_comment(
     comment_id: int,
     request: ModerationActionRequest,
-    token: str = Depends(oauth2_scheme),
-    comment_service: CommentService = Depends()
+    payload: dict = Depends(require_role("editor", "admin")),
+    comment_service: CommentService = Depends(get_comment_service)
 ):
     """
     Take moderation action on a comment.
     SCRUM-17: Implement comment moderation system
     """
-    payload = decode_token(token)
     moderator_id = payload.get("sub")
     
-    if not await comment_service.is_moderator(moderator_id):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
-    
-    if request.action not in ["approve", "reject", "delete"]:
+    if request.action not in _VALID_MOD_ACTIONS:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid action")
     
     result = await comment_service.moderate(
@@ -244,5 +292,7 @@ async def moderate_comment(
         action=request.action,
         reason=request.reason
     )
+    if not result:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
     
     return {"message": f"Comment {request.action}d", "comment_id": comment_id}
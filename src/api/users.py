@@ -7,15 +7,18 @@ SCRUM-32: Add article bookmarking feature
 
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from ..services.user_service import UserService
 from ..services.subscription_service import SubscriptionService
-from ..api.auth import oauth2_scheme
-from ..core.security import decode_token
+from ..services.user_access import invalidate_user_access
+from ..api.auth import get_current_payload
+from ..core.cache import redis_client
 
 router = APIRouter()
 
+_VALID_TIERS = frozenset({"premium", "vip"})  # SCRUM-13
+
 
 class UpdateProfileRequest(BaseModel):
     """SCRUM-14: Profile updates"""
@@ -47,20 +50,18 @@ class ProfileResponse(BaseModel):
     preferred_categories: Optional[List[str]]
     dark_mode: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 @router.get("/me", response_model=ProfileResponse)
 async def get_profile(
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     user_service: UserService = Depends()
 ):
     """
     Get current user's profile.
     SCRUM-14: Create user profile and preferences page
     """
-    payload = decode_token(token)
     user_id = payload.get("sub")
     
     user = await user_service.get_by_id(user_id)
@@ -73,14 +74,13 @@ async def get_profile(
 @router.put("/me", response_model=ProfileResponse)
 async def update_profile(
     request: UpdateProfileRequest,
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     user_service: UserService = Depends()
 ):
     """
     Update user profile.
     SCRUM-14: Create user profile and preferences page
     """
-    payload = decode_token(token)
     user_id = payload.get("sub")
     
     user = await user_service.update_profile(
@@ -96,7 +96,7 @@ async def update_profile(
 @router.put("/me/preferences")
 async def update_preferences(
     request: UpdatePreferencesRequest,
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     user_service: UserService = Depends()
 ):
     """
@@ -104,7 +104,6 @@ async def update_preferences(
     SCRUM-14: Create user profile and preferences page
     SCRUM-35: Add dark mode support
     """
-    payload = decode_token(token)
     user_id = payload.get("sub")
     
     await user_service.update_preferences(
@@ -121,14 +120,13 @@ async def update_preferences(
 
 @router.get("/me/subscription")
 async def get_subscription(
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     subscription_service: SubscriptionService = Depends()
 ):
     """
     Get current subscription status.
     SCRUM-13: Build subscription tier management
     """
-    payload = decode_token(token)
     user_id = payload.get("sub")
     
     subscription = await subscription_service.get_user_subscription(user_id)
@@ -138,17 +136,16 @@ async def get_subscription(
 @router.post("/me/subscription")
 async def subscribe(
     request: SubscribeRequest,
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     subscription_service: SubscriptionService = Depends()
 ):
     """
     Subscribe to a plan.
     SCRUM-13: Build subscription tier management
     """
-    if request.tier not in ["premium", "vip"]:
+    if request.tier not in _VALID_TIERS:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid tier")
     
-    payload = decode_token(token)
     user_id = payload.get("sub")
     
     subscription = await subscription_service.create_subscription(
@@ -156,23 +153,26 @@ async def subscribe(
         tier=request.tier,
         payment_method_id=request.payment_method_id
     )
+    # Premium access is cached per user; don't leave a new subscriber on the old answer
+    await invalidate_user_access(redis_client, user_id)
     
     return {"message": f"Subscribed to {request.tier}", "subscription": subscription}
 
 
 @router.delete("/me/subscription")
 async def cancel_subscription(
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     subscription_service: SubscriptionService = Depends()
 ):
     """
     Cancel subscription (remains active until period end).
     SCRUM-13: Build subscription tier management
     """
-    payload = decode_token(token)
     user_id = payload.get("sub")
     
     result = await subscription_service.cancel_subscription(user_id)
+    await invalidate_user_access(redis_client, user_id)
+    
     return {"message": "Subscription cancelled", "expires_at": result.expires_at}
 
 
@@ -180,14 +180,13 @@ async def cancel_subscription(
 
 @router.get("/me/bookmarks")
 async def get_bookmarks(
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     user_service: UserService = Depends()
 ):
     """
     Get user's bookmarked articles.
     SCRUM-32: Add article bookmarking feature
     """
-    payload = decode_token(token)
     user_id = payload.get("sub")
     
     bookmarks = await user_service.get_bookmarks(user_id)
@@ -197,14 +196,13 @@ async def get_bookmarks(
 @router.post("/me/bookmarks/{article_id}")
 async def add_bookmark(
     article_id: int,
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     user_service: UserService = Depends()
 ):
     """
     Bookmark an article.
     SCRUM-32: Add article bookmarking feature
     """
-    payload = decode_token(token)
     user_id = payload.get("sub")
     
     await user_service.add_bookmark(user_id, article_id)
@@ -214,14 +212,13 @@ async def add_bookmark(
 @router.delete("/me/bookmarks/{article_id}")
 async def remove_bookmark(
     article_id: int,
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     user_service: UserService = Depends()
 ):
     """
     Remove bookmark.
     SCRUM-32: Add article bookmarking feature
     """
-    payload = decode_token(token)
     user_id = payload.get("sub")
     
     await user_service.remove_bookmark(user_id, article_id)
@@ -232,11 +229,10 @@ async def remove_bookmark(
 
 @router.get("/me/history")
 async def get_reading_history(
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_current_payload),
     user_service: UserService = Depends()
 ):
     """Get user's reading history for recommendations - SCRUM-34"""
-    payload = decode_token(token)
     user_id = payload.get("sub")
     
     history = await user_service.get_reading_history(user_id)
@@ -0,0 +1,42 @@
+"""
+Response caching helpers.
+SCRUM-20: Configure Redis caching layer
+"""
+
+from functools import wraps
+from typing import Callable
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from redis import asyncio as aioredis
+
+from .config import settings
+
+redis_client = aioredis.from_url(settings.REDIS_URL)
+
+
+def redis_cached(ttl: int, key_fn: Callable[..., str]):
+    """
+    Cache an endpoint's JSON-encoded result in Redis.
+    key_fn receives the endpoint's keyword arguments and returns the cache key.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(**kwargs):
+            key = key_fn(**kwargs)
+            cached = await redis_client.get(key)
+            if cached:
+                return orjson.loads(cached)
+            
+            result = await func(**kwargs)
+            await redis_client.set(key, orjson.dumps(jsonable_encoder(result)), ex=ttl)
+            return result
+        return wrapper
+    return decorator
+
+
+async def invalidate(pattern: str):
+    """Delete every cached key matching a glob pattern."""
+    keys = [key async for key in redis_client.scan_iter(match=pattern)]
+    if keys:
+        await redis_client.delete(*keys)
@@ -3,7 +3,7 @@ Database configuration.
 SCRUM-19: Set up PostgreSQL database schema for articles
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import Enum, create_engine, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -15,6 +15,28 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def string_enum(enum_cls, length: int = 16) -> Enum:
+    """
+    Column type storing a Python enum's values as VARCHAR guarded by a CHECK
+    constraint, instead of a native Postgres ENUM type.
+    """
+    return Enum(
+        enum_cls,
+        native_enum=False,
+        create_constraint=True,
+        length=length,
+        values_callable=lambda e: [member.value for member in e]
+    )
+
+
+def utc_now():
+    """
+    Server-side UTC timestamp for naive DateTime columns, so Postgres fills
+    in created_at/updated_at rather than each app host's clock.
+    """
+    return func.timezone("utc", func.now())
+
+
 def get_db():
     """Dependency for database session."""
     db = SessionLocal()
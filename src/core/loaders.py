@@ -0,0 +1,41 @@
+"""
+Request-scoped batch loaders.
+SCRUM-16: Resolve comment authors without a query per comment
+"""
+
+from aiodataloader import DataLoader
+from fastapi import Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from .database import get_db
+from ..models.user import User
+
+
+class UserLoader(DataLoader):
+    """Batches user lookups issued in the same event loop tick into one IN query."""
+    
+    def __init__(self, db: Session):
+        super().__init__()
+        self.db = db
+    
+    async def batch_load_fn(self, ids):
+        # Sync session query; keep it off the event loop
+        rows = await run_in_threadpool(
+            self.db.query(User.id, User.display_name, User.avatar_url)
+            .filter(User.id.in_(ids))
+            .all
+        )
+        by_id = {row.id: row for row in rows}
+        return [by_id.get(i) for i in ids]
+
+
+async def get_user_loader(request: Request, db: Session = Depends(get_db)) -> UserLoader:
+    """
+    Dependency returning the UserLoader shared by everything in one request.
+    Async so the loader is built on the event loop, not in FastAPI's threadpool.
+    """
+    loader = getattr(request.state, "user_loader", None)
+    if loader is None:
+        loader = request.state.user_loader = UserLoader(db)
+    return loader
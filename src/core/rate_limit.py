@@ -0,0 +1,106 @@
+"""
+Rate limiting.
+SCRUM-22: Requests per minute for authenticated and anonymous clients
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Deque, Tuple
+
+from cachetools import TTLCache
+from fastapi import Request, status
+from fastapi.responses import ORJSONResponse
+from redis.exceptions import RedisError
+
+from .cache import redis_client
+from .config import settings
+from .security import decode_token
+
+# Increment a window counter and start its expiry in one round-trip
+_incr_window = redis_client.register_script("""
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+""")
+
+_EXEMPT_PATHS = frozenset({"/health"})
+
+logger = logging.getLogger(__name__)
+
+
+class InMemorySlidingWindow:
+    """
+    Process-local sliding window log, used instead of Redis when TESTING and
+    as the fallback while Redis is unreachable.
+    Buckets idle for longer than the largest window are evicted, and the
+    total is capped, so memory stays bounded however many clients appear.
+    """
+    
+    def __init__(self, maxsize: int = 100000, max_window: int = 3600):
+        self.buckets: "TTLCache[str, Deque[float]]" = TTLCache(maxsize=maxsize, ttl=max_window)
+    
+    def hit(self, key: str, window: int) -> int:
+        """Record a request and return how many fall within the last `window` seconds."""
+        now = time.monotonic()
+        dq = self.buckets.get(key)
+        if dq is None:
+            dq = deque()
+        while dq and dq[0] <= now - window:
+            dq.popleft()
+        dq.append(now)
+        # Re-store to restart the idle TTL
+        self.buckets[key] = dq
+        return len(dq)
+    
+    def reset(self):
+        self.buckets.clear()
+
+
+local_limiter = InMemorySlidingWindow()
+
+
+async def hit(key: str, window: int, client=None) -> int:
+    """Record a request against a fixed window counter and return the new count."""
+    if settings.TESTING:
+        # No Redis round-trip (or Redis dependency) in test runs
+        return local_limiter.hit(key, window)
+    return await _incr_window(keys=[key], args=[window], client=client)
+
+
+def _identify(request: Request) -> Tuple[str, int]:
+    """Return the rate limit identity and per-minute limit for a request."""
+    auth = request.headers.get("authorization", "")
+    if auth.lower().startswith("bearer "):
+        payload = decode_token(auth[7:])
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}", settings.RATE_LIMIT_AUTHENTICATED
+    
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}", settings.RATE_LIMIT_ANONYMOUS
+
+
+async def rate_limit_middleware(request: Request, call_next):
+    """Reject clients that exceed their per-minute request limit - SCRUM-22"""
+    if request.url.path in _EXEMPT_PATHS:
+        return await call_next(request)
+    
+    identity, limit = _identify(request)
+    now = int(time.time())
+    try:
+        count = await hit(f"rl:{identity}:{now // 60}", 60)
+    except RedisError:
+        # Don't turn a Redis outage into a 500 on every endpoint; limit per process instead.
+        # The local window slides, so it needs no per-minute key.
+        logger.warning("Rate limit store unavailable, using in-process counter", exc_info=True)
+        count = local_limiter.hit(f"rl:{identity}", 60)
+    if count > limit:
+        return ORJSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": "Rate limit exceeded. Try again later."},
+            headers={"Retry-After": str(60 - now % 60)}
+        )
+    
+    return await call_next(request)
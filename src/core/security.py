@@ -3,9 +3,13 @@ Security utilities for authentication.
 SCRUM-11: Implement JWT authentication with refresh tokens
 """
 
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 import jwt
+from cachetools import TLRUCache
 from passlib.context import CryptContext
 
 from .config import settings
@@ -13,6 +17,17 @@ from .config import settings
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+def _token_cache_expiry(key: str, payload: dict, now: float) -> float:
+    """Keep a verified payload for TOKEN_CACHE_TTL seconds, never past its exp claim."""
+    remaining = payload.get("exp", 0) - time.time()
+    return now + min(settings.TOKEN_CACHE_TTL, remaining)
+
+
+# Verified token payloads keyed by SHA-256 of the raw token - SCRUM-11
+_token_cache = TLRUCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttu=_token_cache_expiry, timer=time.monotonic)
+_token_cache_lock = threading.Lock()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -46,11 +61,24 @@ def create_refresh_token(data: dict) -> str:
 
 
 def decode_token(token: str) -> Optional[dict]:
-    """Decode and validate a JWT token."""
+    """
+    Decode and validate a JWT token.
+    Valid payloads are cached briefly so repeat requests skip signature checks;
+    failed validations are never cached.
+    """
+    key = hashlib.sha256(token.encode()).hexdigest()
+    with _token_cache_lock:
+        payload = _token_cache.get(key)
+    if payload is not None:
+        return payload
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    
+    with _token_cache_lock:
+        _token_cache[key] = payload
+    return payload
@@ -0,0 +1,104 @@
+"""
+Background tasks.
+SCRUM-20: Configure Redis caching layer
+SCRUM-17: Implement comment moderation system
+"""
+
+import asyncio
+
+import redis
+from celery import Celery
+from sqlalchemy import text
+
+from .config import settings
+from .database import SessionLocal
+from ..services.comment_service import COMMENT_COUNT_DELTAS_KEY, CommentService
+from ..services.user_service import UserService
+
+celery_app = Celery("daily_tribune", broker=settings.REDIS_URL)
+
+celery_app.conf.beat_schedule = {
+    "flush-view-counts": {
+        "task": "src.core.tasks.flush_view_counts",
+        "schedule": settings.COUNTER_FLUSH_INTERVAL,
+    },
+    "flush-comment-counts": {
+        "task": "src.core.tasks.flush_comment_counts",
+        "schedule": settings.COUNTER_FLUSH_INTERVAL,
+    },
+}
+
+redis_client = redis.Redis.from_url(settings.REDIS_URL)
+
+
+def _apply_article_deltas(update_sql: str, deltas: dict):
+    """Apply {article_id: delta} to articles in one UNNEST-driven UPDATE."""
+    db = SessionLocal()
+    try:
+        db.execute(
+            text(
+                f"{update_sql}"
+                " FROM (SELECT unnest(CAST(:ids AS int[])) AS id,"
+                " unnest(CAST(:deltas AS int[])) AS delta) AS d"
+                " WHERE articles.id = d.id"
+            ),
+            {"ids": list(deltas.keys()), "deltas": list(deltas.values())}
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+@celery_app.task
+def flush_view_counts():
+    """
+    Move buffered article view counts from Redis into the database.
+    SCRUM-20: Collapses many per-view UPDATEs into one statement per flush.
+    """
+    deltas = {}
+    for key in redis_client.scan_iter(match="article:views:*"):
+        delta = int(redis_client.getdel(key) or 0)
+        if delta:
+            deltas[int(key.rsplit(b":", 1)[1])] = delta
+    
+    if deltas:
+        _apply_article_deltas("UPDATE articles SET view_count = view_count + d.delta", deltas)
+
+
+@celery_app.task
+def flush_comment_counts():
+    """
+    Move buffered article comment count changes from Redis into the database.
+    SCRUM-28: Keeps comment writes off the article row lock.
+    """
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.hgetall(COMMENT_COUNT_DELTAS_KEY)
+    pipe.delete(COMMENT_COUNT_DELTAS_KEY)
+    pending, _ = pipe.execute()
+    
+    deltas = {int(article_id): int(delta) for article_id, delta in pending.items() if int(delta)}
+    if deltas:
+        _apply_article_deltas(
+            "UPDATE articles SET comment_count = GREATEST(0, comment_count + d.delta)",
+            deltas
+        )
+
+
+@celery_app.task
+def flag_comment_task(comment_id: int, reporter_id: int, reason: str):
+    """Flag a comment for moderation outside the request - SCRUM-17"""
+    db = SessionLocal()
+    try:
+        asyncio.run(CommentService(db).flag_comment(comment_id, reporter_id, reason))
+    finally:
+        db.close()
+
+
+@celery_app.task
+def revoke_all_tokens_task(user_id: int):
+    """Revoke a user's refresh tokens outside the request - SCRUM-11"""
+    db = SessionLocal()
+    try:
+        asyncio.run(UserService(db).revoke_all_tokens(user_id))
+    finally:
+        db.close()
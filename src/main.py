@@ -6,23 +6,29 @@ SCRUM-7: Build article publishing workflow API
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .api import articles, auth, users, comments
 from .core.config import settings
+from .core.rate_limit import rate_limit_middleware
 
 app = FastAPI(
     title="Daily Tribune API",
     description="Backend API for Daily Tribune news platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Rate limiting - SCRUM-22 (registered first so CORS wraps it)
+app.middleware("http")(rate_limit_middleware)
+
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["authorization", "content-type"],
 )
 
 # Register routers
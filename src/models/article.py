@@ -6,10 +6,11 @@ SCRUM-19: Set up PostgreSQL database schema for articles
 from datetime import datetime
 from enum import Enum
 from typing import Optional, List
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
-from ..core.database import Base
+from ..core.database import Base, string_enum, utc_now
 
 
 class ArticleStatus(str, Enum):
@@ -24,7 +25,7 @@ class Category(Base):
     """News category (Politics, Sports, etc.)"""
     __tablename__ = "categories"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), unique=True, index=True)
     slug = Column(String(100), unique=True, index=True)
     description = Column(Text, nullable=True)
@@ -41,18 +42,25 @@ class Article(Base):
     """
     __tablename__ = "articles"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     title = Column(String(500), nullable=False, index=True)
     slug = Column(String(500), unique=True, index=True)
     content = Column(Text, nullable=False)
     excerpt = Column(Text, nullable=True)
     
+    # Full-text search document, maintained by Postgres - SCRUM-8
+    # Deferred: only the @@ filter needs it, never the loaded row
+    search_vec = deferred(Column(TSVECTOR, Computed(
+        "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(excerpt, '') || ' ' || coalesce(content, ''))",
+        persisted=True
+    )))
+    
     # Author and category
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
     
     # Publishing status - SCRUM-7
-    status = Column(SQLEnum(ArticleStatus), default=ArticleStatus.DRAFT, index=True)
+    status = Column(string_enum(ArticleStatus), default=ArticleStatus.DRAFT, index=True)
     
     # Media
     featured_image_url = Column(String(500), nullable=True)
@@ -62,16 +70,17 @@ class Article(Base):
     meta_description = Column(String(500), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
+    updated_at = Column(DateTime, server_default=utc_now(), onupdate=utc_now())
     published_at = Column(DateTime, nullable=True)
     scheduled_for = Column(DateTime, nullable=True)  # SCRUM-9: Scheduled publishing
     
     # Metrics
     view_count = Column(Integer, default=0)
+    comment_count = Column(Integer, default=0)  # SCRUM-28: Updated in batches
     
     # Premium content - SCRUM-13
-    is_premium = Column(Integer, default=False)
+    is_premium = Column(Boolean, default=False, nullable=False)
     
     # Relationships
     author = relationship("User", back_populates="articles")
@@ -87,3 +96,15 @@ class Article(Base):
         """Submit article for editorial review - SCRUM-7"""
         if self.status == ArticleStatus.DRAFT:
             self.status = ArticleStatus.PENDING_REVIEW
+
+
+# Keyset pagination over published articles, newest first - SCRUM-8
+Index(
+    "ix_articles_published_keyset",
+    Article.published_at.desc(),
+    Article.id.desc(),
+    postgresql_where=(Article.status == ArticleStatus.PUBLISHED)
+)
+
+# Inverted index for full-text search on search_vec - SCRUM-8
+Index("ix_articles_search_vec", Article.search_vec, postgresql_using="gin")
@@ -4,11 +4,10 @@ SCRUM-15: Comments & Community
 SCRUM-16: Build threaded comment system
 """
 
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, SmallInteger, String, Text, DateTime, ForeignKey, Boolean, CheckConstraint, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 
-from ..core.database import Base
+from ..core.database import Base, utc_now
 
 
 class Comment(Base):
@@ -17,14 +16,18 @@ class Comment(Base):
     SCRUM-16: Build threaded comment system
     """
     __tablename__ = "comments"
+    __table_args__ = (
+        CheckConstraint("depth <= 3", name="ck_comments_depth"),  # SCRUM-16: Max 3 reply levels
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     content = Column(Text, nullable=False)
     
     # Relationships
     article_id = Column(Integer, ForeignKey("articles.id"), nullable=False)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    parent_id = Column(Integer, ForeignKey("comments.id"), nullable=True)  # Threading
+    parent_id = Column(Integer, ForeignKey("comments.id"), nullable=True, index=True)  # Threading
+    depth = Column(SmallInteger, nullable=False, default=0)  # Number of ancestors
     
     # Moderation - SCRUM-17
     is_approved = Column(Boolean, default=True)  # Auto-approved unless flagged
@@ -35,8 +38,8 @@ class Comment(Base):
     moderated_at = Column(DateTime, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
+    updated_at = Column(DateTime, server_default=utc_now(), onupdate=utc_now())
     
     # Relationships
     article = relationship("Article", back_populates="comments")
@@ -45,14 +48,34 @@ class Comment(Base):
     reactions = relationship("Reaction", back_populates="comment", cascade="all, delete-orphan")
 
 
+# Top-level comment listing for an article, newest first - SCRUM-16
+Index(
+    "ix_comments_article_toplevel",
+    Comment.article_id,
+    Comment.created_at.desc(),
+    postgresql_where=(Comment.parent_id.is_(None) & (Comment.is_approved == True))
+)
+
+# Moderation queue, oldest flagged first - SCRUM-17
+Index(
+    "ix_comments_flagged",
+    Comment.created_at,
+    postgresql_where=(Comment.is_flagged == True)
+)
+
+
 class Reaction(Base):
     """
     Reactions on articles and comments.
     SCRUM-18: Add reaction system for articles and comments
     """
     __tablename__ = "reactions"
+    __table_args__ = (
+        Index("ix_reactions_comment_type", "comment_id", "reaction_type"),  # Per-type counts
+        UniqueConstraint("comment_id", "user_id", name="uq_reactions_comment_user"),  # One reaction per user
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     reaction_type = Column(String(20), nullable=False)  # like, love, angry, sad, wow
     
     # Can be on article OR comment (one must be null)
@@ -60,12 +83,27 @@ class Reaction(Base):
     comment_id = Column(Integer, ForeignKey("comments.id"), nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
     
     # Relationships
     comment = relationship("Comment", back_populates="reactions")
 
 
+class CommentReactionCounts(Base):
+    """
+    Per-comment reaction totals, maintained by CommentService.toggle_reaction.
+    SCRUM-18: Reads are a single primary-key lookup instead of an aggregate.
+    """
+    __tablename__ = "comment_reaction_counts"
+
+    comment_id = Column(Integer, ForeignKey("comments.id"), primary_key=True)
+    like = Column(Integer, nullable=False, default=0)
+    love = Column(Integer, nullable=False, default=0)
+    angry = Column(Integer, nullable=False, default=0)
+    sad = Column(Integer, nullable=False, default=0)
+    wow = Column(Integer, nullable=False, default=0)
+
+
 class Bookmark(Base):
     """
     User bookmarks for reading later.
@@ -73,9 +111,10 @@ class Bookmark(Base):
     """
     __tablename__ = "bookmarks"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     article_id = Column(Integer, ForeignKey("articles.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
     
     user = relationship("User", back_populates="bookmarks")
+    article = relationship("Article")  # Eager-load with selectinload(Bookmark.article)
@@ -7,10 +7,10 @@ SCRUM-13: Build subscription tier management
 from datetime import datetime
 from enum import Enum
 from typing import Optional
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean
 from sqlalchemy.orm import relationship
 
-from ..core.database import Base
+from ..core.database import Base, string_enum, utc_now
 
 
 class UserRole(str, Enum):
@@ -35,7 +35,7 @@ class User(Base):
     """
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=True)  # Null for social login
     
@@ -45,12 +45,12 @@ class User(Base):
     avatar_url = Column(String(500), nullable=True)
     
     # Role and permissions
-    role = Column(SQLEnum(UserRole), default=UserRole.READER)
+    role = Column(string_enum(UserRole), default=UserRole.READER)
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
     
     # Subscription - SCRUM-13
-    subscription_tier = Column(SQLEnum(SubscriptionTier), default=SubscriptionTier.FREE)
+    subscription_tier = Column(string_enum(SubscriptionTier), default=SubscriptionTier.FREE)
     subscription_expires_at = Column(DateTime, nullable=True)
     stripe_customer_id = Column(String(100), nullable=True)
     
@@ -64,7 +64,7 @@ class User(Base):
     dark_mode = Column(Boolean, default=False)  # SCRUM-35
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
     last_login_at = Column(DateTime, nullable=True)
     
     # Reading tracking - SCRUM-34
@@ -93,10 +93,10 @@ class Subscription(Base):
     """Subscription history - SCRUM-13"""
     __tablename__ = "subscriptions"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, nullable=False, index=True)
-    tier = Column(SQLEnum(SubscriptionTier), nullable=False)
+    tier = Column(string_enum(SubscriptionTier), nullable=False)
     stripe_subscription_id = Column(String(100), nullable=True)
-    started_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, server_default=utc_now())
     expires_at = Column(DateTime, nullable=True)
     cancelled_at = Column(DateTime, nullable=True)
@@ -5,12 +5,77 @@ SCRUM-8: Create article listing and search functionality
 SCRUM-9: Implement scheduled article publishing
 """
 
+import asyncio
+import base64
+import re
 from datetime import datetime
 from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
+from weakref import WeakValueDictionary
 
-from ..models.article import Article, ArticleStatus
+import msgpack
+import orjson
+from sqlalchemy import func, tuple_, update
+from sqlalchemy.orm import Session, raiseload, selectinload
+
+from ..models.article import Article, ArticleStatus, Category
+from .user_access import has_premium_access
 from ..core.config import settings
+from ..core.database import utc_now
+
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# One in-process lock per slug being loaded, so concurrent misses share a query
+_slug_locks: "WeakValueDictionary[str, asyncio.Lock]" = WeakValueDictionary()
+_FILL_LOCK_TTL = 5  # upper bound on how long a worker may hold a slug fill lock
+_FILL_POLL_INTERVAL = 0.05
+
+# Elasticsearch point-in-time lifetime; matches the search response cache - SCRUM-21
+_PIT_KEEP_ALIVE = "5m"
+
+
+def _to_cache_dict(article: Article) -> dict:
+    """Flatten an article into msgpack-friendly types for the slug cache - SCRUM-20"""
+    return {
+        "id": article.id,
+        "title": article.title,
+        "slug": article.slug,
+        "content": article.content,
+        "excerpt": article.excerpt,
+        "status": article.status.value,
+        "author_id": article.author_id,
+        "author_name": article.author.display_name if article.author else None,
+        "category_id": article.category_id,
+        "category_name": article.category.name if article.category else None,
+        "featured_image_url": article.featured_image_url,
+        "is_premium": article.is_premium,
+        "view_count": article.view_count,
+        "created_at": article.created_at.isoformat(),
+        "published_at": article.published_at.isoformat() if article.published_at else None,
+    }
+
+
+def _decode_list_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Split a listing cursor into its published_at and id; raises ValueError if malformed."""
+    try:
+        published_at, article_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(published_at), int(article_id)
+    except ValueError as exc:
+        raise ValueError("Invalid page cursor") from exc
+
+
+def _encode_cursor(pit_id: str, search_after: list) -> str:
+    """Pack a point-in-time id and sort values into an opaque page cursor."""
+    raw = orjson.dumps({"pit": pit_id, "after": search_after})
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, list]:
+    """Unpack a page cursor; raises ValueError if it is malformed."""
+    try:
+        data = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return data["pit"], data["after"]
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid search cursor") from exc
 
 
 class ArticleService:
@@ -55,16 +120,22 @@ class ArticleService:
         SCRUM-7: Build article publishing workflow API
         State: draft -> pending_review
         """
-        article = self.db.query(Article).filter(
-            Article.id == article_id,
-            Article.author_id == author_id,
-            Article.status == ArticleStatus.DRAFT
-        ).first()
+        # Single UPDATE ... RETURNING; the status guard makes the transition atomic
+        article = self.db.execute(
+            update(Article)
+            .where(
+                Article.id == article_id,
+                Article.author_id == author_id,
+                Article.status == ArticleStatus.DRAFT
+            )
+            .values(status=ArticleStatus.PENDING_REVIEW)
+            .returning(Article)
+        ).scalar_one_or_none()
         
         if not article:
+            self.db.rollback()
             return None
         
-        article.submit_for_review()
         self.db.commit()
         
         # TODO: Notify editors - SCRUM-7
@@ -77,15 +148,21 @@ class ArticleService:
         SCRUM-7: Build article publishing workflow API
         State: pending_review -> published
         """
-        article = self.db.query(Article).filter(
-            Article.id == article_id,
-            Article.status == ArticleStatus.PENDING_REVIEW
-        ).first()
+        # Only one of two concurrent publishers matches the pending_review guard
+        article = self.db.execute(
+            update(Article)
+            .where(
+                Article.id == article_id,
+                Article.status == ArticleStatus.PENDING_REVIEW
+            )
+            .values(status=ArticleStatus.PUBLISHED, published_at=utc_now())
+            .returning(Article)
+        ).scalar_one_or_none()
         
         if not article:
+            self.db.rollback()
             return None
         
-        article.publish()
         self.db.commit()
         
         # Invalidate cache - SCRUM-20
@@ -102,12 +179,22 @@ class ArticleService:
         """
         Schedule article for future publishing.
         SCRUM-9: Implement scheduled article publishing
+        Only unpublished (draft / pending_review) articles can be scheduled.
         """
-        article = self.db.query(Article).filter(Article.id == article_id).first()
+        article = self.db.execute(
+            update(Article)
+            .where(
+                Article.id == article_id,
+                Article.status.in_((ArticleStatus.DRAFT, ArticleStatus.PENDING_REVIEW))
+            )
+            .values(scheduled_for=publish_at)
+            .returning(Article)
+        ).scalar_one_or_none()
+        
         if not article:
+            self.db.rollback()
             return None
         
-        article.scheduled_for = publish_at
         self.db.commit()
         
         # Schedule background job - SCRUM-9
@@ -119,13 +206,23 @@ class ArticleService:
         """
         Cancel scheduled publishing.
         SCRUM-9: Return article to draft status
+        Only applies to an unpublished article that has a schedule set.
         """
-        article = self.db.query(Article).filter(Article.id == article_id).first()
+        article = self.db.execute(
+            update(Article)
+            .where(
+                Article.id == article_id,
+                Article.status.in_((ArticleStatus.DRAFT, ArticleStatus.PENDING_REVIEW)),
+                Article.scheduled_for.isnot(None)
+            )
+            .values(scheduled_for=None, status=ArticleStatus.DRAFT)
+            .returning(Article)
+        ).scalar_one_or_none()
+        
         if not article:
+            self.db.rollback()
             return None
         
-        article.scheduled_for = None
-        article.status = ArticleStatus.DRAFT
         self.db.commit()
         
         return article
@@ -135,38 +232,93 @@ class ArticleService:
         page: int = 1,
         per_page: int = 20,
         category: Optional[str] = None,
-        search_query: Optional[str] = None
-    ) -> Tuple[List[Article], int]:
+        search_query: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Article], int, Optional[str]]:
         """
         List published articles with pagination.
         SCRUM-8: Create article listing and search functionality
+        Pass the returned next_cursor to fetch the following page by keyset
+        instead of OFFSET; page is only used when no cursor is given.
         """
-        query = self.db.query(Article).filter(Article.status == ArticleStatus.PUBLISHED)
+        query = self.db.query(Article) \
+            .options(selectinload(Article.author), selectinload(Article.category)) \
+            .filter(Article.status == ArticleStatus.PUBLISHED)
+        
+        if settings.DEBUG:
+            # Turn un-eager-loaded relationship access into an error
+            query = query.options(raiseload("*"))
         
         if category:
             query = query.join(Article.category).filter(Category.slug == category)
         
         if search_query:
-            # Basic search - for full-text, use Elasticsearch
-            query = query.filter(Article.title.ilike(f"%{search_query}%"))
+            # Postgres full-text search - Elasticsearch handles the /search endpoint
+            query = query.filter(
+                Article.search_vec.op("@@")(func.plainto_tsquery("english", search_query))
+            )
+        
+        total = await self._count_published(query, category, search_query)
+        
+        if cursor:
+            published_at, article_id = _decode_list_cursor(cursor)
+            page_query = query.filter(
+                tuple_(Article.published_at, Article.id) < (published_at, article_id)
+            )
+        else:
+            page_query = query.offset((page - 1) * per_page)
         
-        total = query.count()
-        articles = query.order_by(Article.published_at.desc()) \
-            .offset((page - 1) * per_page) \
+        articles = page_query \
+            .order_by(Article.published_at.desc(), Article.id.desc()) \
             .limit(per_page) \
             .all()
         
-        return articles, total
+        next_cursor = None
+        if len(articles) == per_page:
+            last = articles[-1]
+            next_cursor = f"{last.published_at.isoformat()}_{last.id}"
+        
+        return articles, total, next_cursor
     
-    async def search(self, query: str, page: int = 1, per_page: int = 20):
+    async def _count_published(self, query, category: Optional[str], search_query: Optional[str]) -> int:
+        """Count listing matches, cached so pages don't each scan every row - SCRUM-20"""
+        key = f"articles:count:{category}:{search_query}"
+        if self.cache:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return int(cached)
+        
+        total = query.order_by(None).count()
+        
+        if self.cache:
+            await self.cache.set(key, total, ex=settings.CACHE_TTL)
+        
+        return total
+    
+    async def search(
+        self,
+        query: str,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: Optional[str] = None
+    ):
         """
         Full-text search using Elasticsearch.
         SCRUM-8: Create article listing and search functionality
         SCRUM-21: Set up Elasticsearch for article search
+        Pages after the first should pass the previous response's next_cursor,
+        which pages with search_after over a point-in-time instead of from/size.
         """
         if not self.search:
-            # Fallback to DB search
-            return await self.list_published(page=page, per_page=per_page, search_query=query)
+            # Fallback to DB search, keyset-paged with the listing cursor
+            articles, total, next_cursor = await self.list_published(
+                page=page, per_page=per_page, search_query=query, cursor=cursor
+            )
+            return {
+                "hits": [_to_cache_dict(a) for a in articles],
+                "total": total,
+                "next_cursor": next_cursor
+            }
         
         # Elasticsearch query
         body = {
@@ -177,34 +329,124 @@ class ArticleService:
                     "fuzziness": "AUTO"
                 }
             },
-            "from": (page - 1) * per_page,
+            "sort": [{"_score": "desc"}, {"id": "asc"}],
             "size": per_page
         }
         
-        results = await self.search.search(index="articles", body=body)
-        return results
+        if cursor:
+            pit_id, search_after = _decode_cursor(cursor)
+            body["search_after"] = search_after
+        else:
+            pit_id = await self._get_pit(query)
+            body["from"] = (page - 1) * per_page
+        
+        body["pit"] = {"id": pit_id, "keep_alive": _PIT_KEEP_ALIVE}
+        
+        results = await self.search.search(body=body)
+        hits = results["hits"]["hits"]
+        
+        next_cursor = None
+        if len(hits) == per_page:
+            next_cursor = _encode_cursor(results.get("pit_id", pit_id), hits[-1]["sort"])
+        
+        return {
+            "hits": hits,
+            "total": results["hits"]["total"]["value"],
+            "next_cursor": next_cursor
+        }
+    
+    async def _get_pit(self, query: str) -> str:
+        """Open, or reuse from Redis, a point-in-time for a search query - SCRUM-21"""
+        # Under articles:* so publishing drops it along with the cached results
+        key = f"articles:search_pit:{query}"
+        if self.cache:
+            pit_id = await self.cache.get(key)
+            if pit_id:
+                return pit_id.decode() if isinstance(pit_id, bytes) else pit_id
+        
+        response = await self.search.open_point_in_time(index="articles", keep_alive=_PIT_KEEP_ALIVE)
+        pit_id = response["id"]
+        
+        if self.cache:
+            await self.cache.set(key, pit_id, ex=300)
+        
+        return pit_id
     
-    async def get_by_slug(self, slug: str) -> Optional[Article]:
-        """Get article by slug with caching."""
+    async def get_by_slug(self, slug: str) -> Optional[dict]:
+        """
+        Get article by slug with caching.
+        Returns the article's response fields as a plain dict.
+        On a cache miss only one request per slug queries the database;
+        concurrent requests wait for it to fill the cache.
+        """
+        if not self.cache:
+            return await self._load_by_slug(slug)
+        
+        key = f"article:{slug}"
+        
         # Try cache first - SCRUM-20
-        if self.cache:
-            cached = await self.cache.get(f"article:{slug}")
-            if cached:
-                return cached
+        cached = await self.cache.get(key)
+        if cached:
+            return msgpack.unpackb(cached, raw=False)
+        
+        lock = _slug_locks.get(slug)
+        if lock is None:
+            lock = _slug_locks[slug] = asyncio.Lock()
         
-        article = self.db.query(Article).filter(
+        async with lock:
+            # Another coroutine in this process may have filled it meanwhile
+            cached = await self.cache.get(key)
+            if cached:
+                return msgpack.unpackb(cached, raw=False)
+            
+            # Across workers, the first to take the Redis lock does the query
+            lock_key = f"lock:{key}"
+            if await self.cache.set(lock_key, 1, nx=True, ex=_FILL_LOCK_TTL):
+                try:
+                    return await self._load_by_slug(slug)
+                finally:
+                    await self.cache.delete(lock_key)
+            
+            while await self.cache.exists(lock_key):
+                await asyncio.sleep(_FILL_POLL_INTERVAL)
+                cached = await self.cache.get(key)
+                if cached:
+                    return msgpack.unpackb(cached, raw=False)
+            
+            # The lock was released without a cache fill (e.g. no such article)
+            return await self._load_by_slug(slug)
+    
+    async def _load_by_slug(self, slug: str) -> Optional[dict]:
+        """Query a published article by slug and populate the slug cache."""
+        article = self.db.query(Article).options(
+            selectinload(Article.author),
+            selectinload(Article.category)
+        ).filter(
             Article.slug == slug,
             Article.status == ArticleStatus.PUBLISHED
         ).first()
         
+        if not article:
+            return None
+        
+        data = _to_cache_dict(article)
+        
         # Cache for 5 minutes - SCRUM-20
-        if article and self.cache:
-            await self.cache.set(f"article:{slug}", article, ex=settings.CACHE_TTL)
+        if self.cache:
+            await self.cache.set(f"article:{slug}", msgpack.packb(data), ex=settings.CACHE_TTL)
         
-        return article
+        return data
     
     async def increment_views(self, article_id: int):
-        """Increment article view count."""
+        """
+        Increment article view count.
+        SCRUM-20: Counted in Redis and flushed to the database in batches
+        by the flush_view_counts task.
+        """
+        if self.cache:
+            await self.cache.incr(f"article:views:{article_id}")
+            return
+        
         self.db.query(Article).filter(Article.id == article_id).update(
             {"view_count": Article.view_count + 1}
         )
@@ -216,23 +458,12 @@ class ArticleService:
         SCRUM-13, SCRUM-29: Premium content accessible without subscription (BUG)
         """
         # This needs to be checked BEFORE serving content to fix SCRUM-29
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return False
-        return user.can_access_premium()
-    
-    async def is_editor(self, user_id: int) -> bool:
-        """Check if user is an editor."""
-        user = self.db.query(User).filter(User.id == user_id).first()
-        return user and user.role in [UserRole.EDITOR, UserRole.ADMIN]
+        return await has_premium_access(self.db, self.cache, user_id)
     
     def _generate_slug(self, title: str) -> str:
         """Generate URL-safe slug from title."""
-        import re
-        slug = title.lower()
-        slug = re.sub(r'[^a-z0-9]+', '-', slug)
-        slug = slug.strip('-')
-        return f"{slug}-{datetime.now().strftime('%Y%m%d')}"
+        slug = _SLUG_RE.sub('-', title.lower()).strip('-')
+        return f"{slug}-{datetime.utcnow():%Y%m%d}"
     
     async def _index_article(self, article: Article):
         """Index article in Elasticsearch - SCRUM-21"""
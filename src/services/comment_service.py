@@ -5,20 +5,61 @@ SCRUM-17: Implement comment moderation system
 SCRUM-18: Add reaction system for articles and comments
 """
 
-from datetime import datetime, timedelta
 from typing import List, Optional
-from sqlalchemy.orm import Session
 
-from ..models.comment import Comment, Reaction
-from ..models.user import UserRole
+import orjson
+from sqlalchemy import func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, raiseload
+
+from ..models.comment import Comment, CommentReactionCounts, Reaction
+from ..models.user import User
+from ..core.cache import redis_client
+from ..core.config import settings
+from ..core.database import utc_now
+from ..core.rate_limit import hit
+
+
+# Redis hash of pending per-article comment count changes, drained by
+# core.tasks.flush_comment_counts - SCRUM-28
+COMMENT_COUNT_DELTAS_KEY = "article_comment_delta"
+
+
+def _reaction_counts_key(comment_id: int) -> str:
+    """Redis hash holding per-type reaction counts - SCRUM-18"""
+    return f"comment:{comment_id}:reactions"
+
+
+# Apply per-type deltas only to a warm hash, atomically with the existence check
+_incr_if_cached = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 1, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+""")
+
+
+def _thread_version_key(article_id: int) -> str:
+    """Counter bumped on every write to an article's comments - SCRUM-16"""
+    return f"comments:article:{article_id}:version"
+
+
+def _thread_cache_key(article_id: int, version: int) -> str:
+    """Redis hash of an article's serialized comment pages, one field per page - SCRUM-16"""
+    return f"comments:article:{article_id}:v{version}"
 
 
 class CommentService:
     """Service for comment operations."""
     
-    def __init__(self, db: Session, cache=None):
+    def __init__(self, db: Session, cache=None, user_loader=None):
         self.db = db
         self.cache = cache  # Redis for rate limiting and reaction counts
+        self.user_loader = user_loader  # Request-scoped UserLoader
     
     async def create(
         self,
@@ -30,20 +71,37 @@ class CommentService:
         """
         Create a new comment.
         SCRUM-16: Build threaded comment system
+        Raises ValueError if the reply would exceed the maximum nesting depth.
         """
+        # Depth is computed from the parent inside the INSERT itself
+        depth = 0
+        if parent_id:
+            depth = func.coalesce(
+                select(Comment.depth + 1).where(Comment.id == parent_id).scalar_subquery(),
+                0
+            )
+        
         comment = Comment(
             content=content,
             article_id=article_id,
             author_id=author_id,
-            parent_id=parent_id
+            parent_id=parent_id,
+            depth=depth
         )
         
         self.db.add(comment)
-        self.db.commit()
+        try:
+            self.db.commit()
+        except IntegrityError as exc:
+            self.db.rollback()
+            if "ck_comments_depth" in str(exc.orig):
+                raise ValueError("Maximum reply depth reached") from exc
+            raise
         self.db.refresh(comment)
         
         # Update article comment count - careful to avoid SCRUM-28 bug
         await self._update_comment_count(article_id, 1)
+        await self._invalidate_thread(article_id)
         
         return comment
     
@@ -62,8 +120,8 @@ class CommentService:
             return None
         
         comment.content = content
-        comment.updated_at = datetime.utcnow()
         self.db.commit()
+        await self._invalidate_thread(comment.article_id)
         
         return comment
     
@@ -86,6 +144,7 @@ class CommentService:
         
         # Update count - SCRUM-28: Use atomic operation to avoid race condition
         await self._update_comment_count(comment.article_id, -1)
+        await self._invalidate_thread(comment.article_id)
         
         return True
     
@@ -94,13 +153,27 @@ class CommentService:
         article_id: int,
         page: int = 1,
         per_page: int = 50
-    ) -> List[Comment]:
+    ) -> List[dict]:
         """
         Get comments for an article with threading.
         SCRUM-16: Build threaded comment system
+        Returns a page of top-level comments followed by their replies, oldest first.
         """
+        page_field = f"{page}:{per_page}"
+        if self.cache:
+            # Pin the version before reading the DB, so a page loaded before an
+            # invalidation is written under the superseded key, never the live one
+            version = int(await self.cache.get(_thread_version_key(article_id)) or 0)
+            cache_key = _thread_cache_key(article_id, version)
+            cached = await self.cache.hget(cache_key, page_field)
+            if cached:
+                return orjson.loads(cached)
+        
+        # Turn un-eager-loaded relationship access into an error
+        load_options = [raiseload("*")] if settings.DEBUG else []
+        
         # Get top-level comments first
-        comments = self.db.query(Comment).filter(
+        roots = self.db.query(Comment).options(*load_options).filter(
             Comment.article_id == article_id,
             Comment.parent_id == None,
             Comment.is_approved == True
@@ -109,40 +182,46 @@ class CommentService:
          .limit(per_page) \
          .all()
         
-        # Load replies (limited to 3 levels) - SCRUM-16
-        return self._build_comment_tree(comments)
-    
-    async def get_comment_depth(self, comment_id: int) -> int:
-        """
-        Get nesting depth of a comment.
-        SCRUM-16: Limit nesting to 3 levels
-        """
-        depth = 0
-        current_id = comment_id
+        if not roots:
+            return []
         
-        while current_id:
-            comment = self.db.query(Comment).filter(Comment.id == current_id).first()
-            if not comment or not comment.parent_id:
-                break
-            current_id = comment.parent_id
-            depth += 1
+        # Load the reply subtrees of this page's comments in one recursive query - SCRUM-16
+        thread = select(Comment.id).where(
+            Comment.parent_id.in_([c.id for c in roots]),
+            Comment.is_approved == True
+        ).cte("thread", recursive=True)
+        thread = thread.union_all(
+            select(Comment.id)
+            .join(thread, Comment.parent_id == thread.c.id)
+            .where(Comment.is_approved == True)
+        )
+        replies = self.db.query(Comment) \
+            .options(*load_options) \
+            .filter(Comment.id.in_(select(thread.c.id))) \
+            .order_by(Comment.created_at.asc()) \
+            .all()
+        
+        result = await self._serialize_comments(roots + replies)
+        
+        if self.cache:
+            # TTL is set once, when the hash is created, so later pages don't extend earlier ones
+            async with self.cache.pipeline(transaction=True) as pipe:
+                pipe.hset(cache_key, page_field, orjson.dumps(result))
+                pipe.expire(cache_key, settings.CACHE_TTL, nx=True)
+                await pipe.execute()
         
-        return depth
+        return result
     
     async def check_rate_limit(self, user_id: int) -> bool:
         """
         Check comment rate limit (10/hour).
         SCRUM-16: Rate limiting requirement
         """
-        if not self.cache:
+        if not self.cache and not settings.TESTING:
             return True
         
-        key = f"comment_rate:{user_id}"
-        count = await self.cache.incr(key)
-        
-        if count == 1:
-            await self.cache.expire(key, 3600)  # 1 hour window
-        
+        # INCR and EXPIRE run together in one script call
+        count = await hit(f"comment_rate:{user_id}", 3600, client=self.cache)  # 1 hour window
         return count <= 10
     
     # ============ Reactions - SCRUM-18 ============
@@ -152,35 +231,67 @@ class CommentService:
         Add or remove a reaction.
         SCRUM-18: Add reaction system for articles and comments
         """
-        existing = self.db.query(Reaction).filter(
-            Reaction.comment_id == comment_id,
-            Reaction.user_id == user_id
-        ).first()
+        # Per-type count changes to mirror into the roll-up row and Redis hash
+        deltas = {}
         
-        if existing:
-            if existing.reaction_type == reaction_type:
-                # Remove reaction if clicking same type
-                self.db.delete(existing)
-                action = "removed"
-            else:
-                # Change reaction type
-                existing.reaction_type = reaction_type
-                action = "changed"
+        # Lock the user's current reaction, or insert one. If a concurrent request
+        # inserts first, ON CONFLICT DO NOTHING waits for it to commit and the
+        # next locked read sees its row, so the previous type is never missed.
+        while True:
+            existing = self.db.query(Reaction.id, Reaction.reaction_type).filter(
+                Reaction.comment_id == comment_id,
+                Reaction.user_id == user_id
+            ).with_for_update().first()
+            if existing:
+                break
+            
+            inserted = self.db.execute(
+                insert(Reaction)
+                .values(comment_id=comment_id, user_id=user_id, reaction_type=reaction_type)
+                .on_conflict_do_nothing(index_elements=["comment_id", "user_id"])
+                .returning(Reaction.id)
+            ).first()
+            if inserted:
+                break
+        
+        if existing is None:
+            deltas[reaction_type] = 1
+            action = "added"
+        elif existing.reaction_type == reaction_type:
+            # Same type already present - clicking it again removes it
+            self.db.query(Reaction).filter(Reaction.id == existing.id) \
+                .delete(synchronize_session=False)
+            deltas[reaction_type] = -1
+            action = "removed"
         else:
-            # Add new reaction
-            reaction = Reaction(
+            self.db.query(Reaction).filter(Reaction.id == existing.id) \
+                .update({Reaction.reaction_type: reaction_type}, synchronize_session=False)
+            deltas[existing.reaction_type] = -1
+            deltas[reaction_type] = 1
+            action = "changed"
+        
+        # Apply the same deltas to the roll-up row in the same transaction
+        if deltas:
+            rollup = insert(CommentReactionCounts).values(
                 comment_id=comment_id,
-                user_id=user_id,
-                reaction_type=reaction_type
+                **{r_type: max(delta, 0) for r_type, delta in deltas.items()}
+            ).on_conflict_do_update(
+                index_elements=["comment_id"],
+                set_={
+                    r_type: getattr(CommentReactionCounts, r_type) + delta
+                    for r_type, delta in deltas.items()
+                }
             )
-            self.db.add(reaction)
-            action = "added"
-        
+            self.db.execute(rollup)
         self.db.commit()
         
-        # Invalidate cache - SCRUM-18 uses Redis for counts
-        if self.cache:
-            await self.cache.delete(f"reactions:{comment_id}")
+        # Update counts in place - SCRUM-18 uses Redis for counts.
+        # A cold hash is left alone and populated from the DB on next read.
+        if self.cache and deltas:
+            args = [part for r_type, delta in deltas.items() for part in (r_type, delta)]
+            await _incr_if_cached(
+                keys=[_reaction_counts_key(comment_id)], args=args, client=self.cache
+            )
         
         counts = await self.get_reaction_counts(comment_id)
         return {"action": action, "counts": counts}
@@ -190,25 +301,34 @@ class CommentService:
         Get reaction counts for a comment.
         SCRUM-18: Uses Redis for real-time counts
         """
+        counts = {"like": 0, "love": 0, "angry": 0, "sad": 0, "wow": 0}
+        
         # Try cache first
         if self.cache:
-            cached = await self.cache.get(f"reactions:{comment_id}")
+            cached = await self.cache.hgetall(_reaction_counts_key(comment_id))
             if cached:
-                return cached
+                for r_type, count in cached.items():
+                    if isinstance(r_type, bytes):
+                        r_type = r_type.decode()
+                    counts[r_type] = int(count)
+                return counts
         
-        # Query database
-        reactions = self.db.query(Reaction).filter(
-            Reaction.comment_id == comment_id
-        ).all()
+        # Read the roll-up row kept current by toggle_reaction
+        rollup = self.db.query(CommentReactionCounts).filter(
+            CommentReactionCounts.comment_id == comment_id
+        ).first()
         
-        counts = {"like": 0, "love": 0, "angry": 0, "sad": 0, "wow": 0}
-        for r in reactions:
-            if r.reaction_type in counts:
-                counts[r.reaction_type] += 1
+        if rollup:
+            counts = {r_type: getattr(rollup, r_type) for r_type in counts}
         
-        # Cache results
+        # Populate the hash that toggle_reaction keeps up to date. The TTL bounds
+        # both memory and any drift from a toggle racing this fill.
         if self.cache:
-            await self.cache.set(f"reactions:{comment_id}", counts, ex=300)
+            key = _reaction_counts_key(comment_id)
+            async with self.cache.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping=counts)
+                pipe.expire(key, settings.CACHE_TTL)
+                await pipe.execute()
         
         return counts
     
@@ -241,50 +361,88 @@ class CommentService:
         moderator_id: int,
         action: str,
         reason: Optional[str] = None
-    ) -> Comment:
+    ) -> Optional[Comment]:
         """
         Take moderation action.
         SCRUM-17: Implement comment moderation system
         """
-        comment = self.db.query(Comment).filter(Comment.id == comment_id).first()
-        
+        values = {"moderated_by": moderator_id, "moderated_at": utc_now()}
         if action == "approve":
-            comment.is_flagged = False
-            comment.is_approved = True
+            values.update(is_flagged=False, is_approved=True)
         elif action == "reject":
-            comment.is_approved = False
+            values.update(is_approved=False)
         elif action == "delete":
-            comment.is_deleted = True
-            comment.content = "[Removed by moderator]"
-            await self._update_comment_count(comment.article_id, -1)
+            values.update(is_deleted=True, content="[Removed by moderator]")
         
-        comment.moderated_by = moderator_id
-        comment.moderated_at = datetime.utcnow()
+        stmt = update(Comment).where(Comment.id == comment_id)
+        if action == "delete":
+            # Guard so a repeated delete doesn't decrement the count twice
+            stmt = stmt.where(Comment.is_deleted == False)
+        
+        comment = self.db.execute(
+            stmt.values(**values).returning(Comment)
+        ).scalar_one_or_none()
+        
+        if not comment:
+            self.db.rollback()
+            return None
         
         self.db.commit()
         
+        if action == "delete":
+            await self._update_comment_count(comment.article_id, -1)
+        await self._invalidate_thread(comment.article_id)
+        
         # Log moderation action - SCRUM-17
         
         return comment
     
-    async def is_moderator(self, user_id: int) -> bool:
-        """Check if user is a moderator."""
-        user = self.db.query(User).filter(User.id == user_id).first()
-        return user and user.role in [UserRole.EDITOR, UserRole.ADMIN]
-    
     async def _update_comment_count(self, article_id: int, delta: int):
         """
         Atomically update article comment count.
         SCRUM-28 FIX: Use atomic update to prevent race condition
+        With Redis, deltas are accumulated and applied by flush_comment_counts.
         """
-        from sqlalchemy import text
+        if self.cache:
+            await self.cache.hincrby(COMMENT_COUNT_DELTAS_KEY, article_id, delta)
+            return
+        
         self.db.execute(
             text("UPDATE articles SET comment_count = GREATEST(0, comment_count + :delta) WHERE id = :id"),
             {"delta": delta, "id": article_id}
         )
         self.db.commit()
     
-    def _build_comment_tree(self, comments: List[Comment]) -> List[dict]:
-        """Build nested comment tree for API response."""
-        # Implementation would recursively load replies
-        return comments
+    async def _invalidate_thread(self, article_id: int):
+        """Retire only this article's cached comment pages after a write - SCRUM-16"""
+        if self.cache:
+            # The old hash is left to its TTL
+            await self.cache.incr(_thread_version_key(article_id))
+    
+    async def _serialize_comments(self, comments: List[Comment]) -> List[dict]:
+        """
+        Serialize comments as a flat list for the API response.
+        SCRUM-16: Clients assemble threads by parent_id.
+        """
+        # Resolve all author names with a single IN query
+        author_ids = list({c.author_id for c in comments})
+        if self.user_loader:
+            authors = await self.user_loader.load_many(author_ids)
+            names = {a.id: a.display_name for a in authors if a}
+        else:
+            names = dict(
+                self.db.query(User.id, User.display_name).filter(User.id.in_(author_ids)).all()
+            )
+        
+        return [
+            {
+                "id": c.id,
+                "content": c.content,
+                "article_id": c.article_id,
+                "author_id": c.author_id,
+                "author_name": names.get(c.author_id),
+                "parent_id": c.parent_id,
+                "created_at": c.created_at,
+            }
+            for c in comments
+        ]
@@ -0,0 +1,36 @@
+"""
+Cached user access lookups shared by the services.
+SCRUM-13: Build subscription tier management
+"""
+
+from sqlalchemy.orm import Session
+
+from ..models.user import User
+
+ACCESS_CACHE_TTL = 60  # seconds; subscriptions change rarely
+
+
+def premium_cache_key(user_id: int) -> str:
+    return f"user_premium:{user_id}"
+
+
+async def has_premium_access(db: Session, cache, user_id: int) -> bool:
+    """Return whether a user can read premium content, from Redis when cached."""
+    if cache:
+        cached = await cache.get(premium_cache_key(user_id))
+        if cached is not None:
+            return cached in (b"1", "1")
+    
+    user = db.query(User).filter(User.id == user_id).first()
+    can_access = bool(user and user.can_access_premium())
+    
+    if cache:
+        await cache.set(premium_cache_key(user_id), int(can_access), ex=ACCESS_CACHE_TTL)
+    
+    return can_access
+
+
+async def invalidate_user_access(cache, user_id: int):
+    """Drop cached premium access after a subscription change."""
+    if cache:
+        await cache.delete(premium_cache_key(user_id))